@@ -1,41 +1,150 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 import calendar
 import os
 
-# File paths
-CLIENTS_FILE = 'clients.csv'
-TIME_ENTRIES_FILE = 'time_entries.csv'
-INVOICES_FILE = 'invoices.csv'
-SETTINGS_FILE = 'settings.csv'
-NON_WORK_DAYS_FILE = 'non_work_days.csv'
+# Copy-on-write: slices share data until written, so defensive copies of
+# display-only frames cost nothing. Always on (and no longer settable)
+# from pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# File paths (Feather - much faster to read/write than CSV and dates
+# round-trip natively as datetime64, so no re-parsing on load)
+CLIENTS_FILE = 'clients.feather'
+TIME_ENTRIES_FILE = 'time_entries.feather'
+INVOICES_FILE = 'invoices.feather'
+SETTINGS_FILE = 'settings.feather'
+NON_WORK_DAYS_FILE = 'non_work_days.feather'
+
+# Date columns per table, used by the one-shot CSV migration
+_DATE_COLUMNS = {
+    TIME_ENTRIES_FILE: ['date'],
+    INVOICES_FILE: ['date'],
+    NON_WORK_DAYS_FILE: ['date'],
+}
+
+def _journal_path(path):
+    return path + '.log'
+
+# Fold the append journal back into the Feather file once it reaches this
+# many rows, so the per-load merge stays bounded
+_JOURNAL_COMPACT_ROWS = 200
+
+# Single background writer so Save buttons return immediately instead of
+# blocking the rerun on disk I/O; one worker keeps writes ordered
+_WRITE_POOL = ThreadPoolExecutor(max_workers=1)
+_PENDING_WRITES = []
+
+def _write_feather_sync(df, path):
+    # Write to a sidecar and replace atomically so readers never see a
+    # half-written table
+    tmp_path = path + '.tmp'
+    df.reset_index(drop=True).to_feather(tmp_path)
+    os.replace(tmp_path, path)
+    # A full rewrite supersedes any journaled appends
+    log_path = _journal_path(path)
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+def _write_feather(df, path):
+    _PENDING_WRITES.append(_WRITE_POOL.submit(_write_feather_sync, df, path))
+
+def _drain_writes():
+    """Block until queued writes land; loaders call this before reading.
+
+    The rerun that follows a save starts before the background write
+    finishes, so reads wait here. Write errors surface on the next read,
+    inside the loaders' existing error handling.
+    """
+    while _PENDING_WRITES:
+        _PENDING_WRITES.pop().result()
+
+def _append_row(path, row):
+    """O(1) append: write one CSV line to the table's journal file.
+
+    Feather has no append mode, so single-row adds go to a sidecar
+    journal that loaders merge in; the next full save_* rewrite compacts
+    it away. Appending stays constant-time no matter how large the
+    history grows.
+    """
+    _drain_writes()  # a queued full rewrite would discard this journal line
+    log_path = _journal_path(path)
+    pd.DataFrame([row]).to_csv(log_path, mode='a', header=not os.path.exists(log_path), index=False)
+    _read_feather_cached.clear()
+
+def _table_mtimes(path):
+    log_path = _journal_path(path)
+    return os.path.getmtime(path), os.path.getmtime(log_path) if os.path.exists(log_path) else None
+
+def _migrate_csv_to_feather(feather_path):
+    """One-shot migration from the old CSV files to Feather."""
+    csv_path = os.path.splitext(feather_path)[0] + '.csv'
+    if os.path.exists(csv_path) and not os.path.exists(feather_path):
+        df = pd.read_csv(csv_path)
+        for col in _DATE_COLUMNS.get(feather_path, []):
+            # Dates were written by to_csv, so they are always ISO8601;
+            # saying so skips pandas' per-value format inference
+            df[col] = pd.to_datetime(df[col], format='ISO8601')
+        _write_feather_sync(df, feather_path)
+        os.remove(csv_path)
 
 # Initialize data files
 def initialize_files():
     try:
+        for path in (CLIENTS_FILE, TIME_ENTRIES_FILE, INVOICES_FILE, SETTINGS_FILE, NON_WORK_DAYS_FILE):
+            _migrate_csv_to_feather(path)
+
         if not os.path.exists(CLIENTS_FILE):
-            pd.DataFrame(columns=['client_name', 'hourly_rate', 'billing_type', 'active', 'has_hour_limit', 'limit_type', 'hour_limit', 'contract_start_date']).to_csv(CLIENTS_FILE, index=False)
-        
+            _write_feather_sync(pd.DataFrame(columns=['client_name', 'hourly_rate', 'billing_type', 'active', 'has_hour_limit', 'limit_type', 'hour_limit', 'contract_start_date']), CLIENTS_FILE)
+
         if not os.path.exists(TIME_ENTRIES_FILE):
-            pd.DataFrame(columns=['date', 'client_name', 'hours', 'notes']).to_csv(TIME_ENTRIES_FILE, index=False)
-        
+            _write_feather_sync(pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'client_name': pd.Series(dtype=object), 'hours': pd.Series(dtype=float), 'notes': pd.Series(dtype=object)}), TIME_ENTRIES_FILE)
+
         if not os.path.exists(INVOICES_FILE):
-            pd.DataFrame(columns=['date', 'client_name', 'amount', 'type', 'description']).to_csv(INVOICES_FILE, index=False)
-        
+            _write_feather_sync(pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'client_name': pd.Series(dtype=object), 'amount': pd.Series(dtype=float), 'type': pd.Series(dtype=object), 'description': pd.Series(dtype=object)}), INVOICES_FILE)
+
         if not os.path.exists(SETTINGS_FILE):
-            pd.DataFrame({'monthly_target': [8000.0], 'work_days': ['Monday,Tuesday,Wednesday,Thursday,Friday']}).to_csv(SETTINGS_FILE, index=False)
-        
+            _write_feather_sync(pd.DataFrame({'monthly_target': [8000.0], 'work_days': ['Monday,Tuesday,Wednesday,Thursday,Friday']}), SETTINGS_FILE)
+
         if not os.path.exists(NON_WORK_DAYS_FILE):
-            pd.DataFrame(columns=['date', 'reason']).to_csv(NON_WORK_DAYS_FILE, index=False)
+            _write_feather_sync(pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'reason': pd.Series(dtype=object)}), NON_WORK_DAYS_FILE)
     except Exception as e:
         st.error(f"Error initializing files: {str(e)}")
 
+# Cached Feather reader - keyed on the file's (and journal's) mtime so
+# unchanged files are served from memory instead of being re-read per rerun
+@st.cache_data(show_spinner=False)
+def _read_feather_cached(path, mtime, journal_mtime=None):
+    df = pd.read_feather(path)
+    log_path = _journal_path(path)
+    if journal_mtime is not None and os.path.exists(log_path):
+        journal = pd.read_csv(log_path)
+        for col in _DATE_COLUMNS.get(path, []):
+            journal[col] = pd.to_datetime(journal[col], format='ISO8601')
+        df = pd.concat([df, journal], ignore_index=True)
+        if len(journal) >= _JOURNAL_COMPACT_ROWS:
+            # Compact: rewrite the table with the journal folded in (this
+            # also deletes the journal). The changed mtimes cause one
+            # re-read next rerun, after which loads merge nothing.
+            _write_feather_sync(df, path)
+    # Keep dated tables sorted so month filters can binary-search; done
+    # here so it happens once per file version, not per rerun
+    date_cols = _DATE_COLUMNS.get(path, [])
+    if date_cols and not df.empty:
+        df = df.sort_values(date_cols[0], ignore_index=True)
+    return df
+
 # Load data
 def load_clients():
     try:
-        df = pd.read_csv(CLIENTS_FILE)
+        _drain_writes()
+        df = _read_feather_cached(CLIENTS_FILE, *_table_mtimes(CLIENTS_FILE))
         if df.empty:
             return pd.DataFrame(columns=['client_name', 'hourly_rate', 'billing_type', 'active', 'has_hour_limit', 'limit_type', 'hour_limit', 'contract_start_date'])
         
@@ -51,9 +160,16 @@ def load_clients():
         if 'contract_start_date' not in df.columns:
             df['contract_start_date'] = None
         
-        df['hourly_rate'] = df['hourly_rate'].fillna(0)
-        df['hour_limit'] = df['hour_limit'].fillna(0)
-        df['has_hour_limit'] = df['has_hour_limit'].fillna(False)
+        # Narrow dtypes once at load; float32 keeps plenty of precision
+        # for rates/limits and halves the memory of every downstream copy
+        df['hourly_rate'] = df['hourly_rate'].fillna(0).astype(np.float32)
+        df['hour_limit'] = df['hour_limit'].fillna(0).astype(np.float32)
+        df['has_hour_limit'] = df['has_hour_limit'].fillna(False).astype(bool)
+        # Low-cardinality labels become categoricals (client_name stays
+        # object here - it is the unique key and freely editable). Fixed
+        # category lists match the UI options so edits assign cleanly.
+        df['billing_type'] = pd.Categorical(df['billing_type'], categories=['Hourly', 'Retainer/Flat Fee'])
+        df['limit_type'] = pd.Categorical(df['limit_type'], categories=['None', 'Monthly', 'Contract Total'])
         
         return df
     except Exception as e:
@@ -62,10 +178,14 @@ def load_clients():
 
 def load_time_entries():
     try:
-        df = pd.read_csv(TIME_ENTRIES_FILE)
+        _drain_writes()
+        df = _read_feather_cached(TIME_ENTRIES_FILE, *_table_mtimes(TIME_ENTRIES_FILE))
         if df.empty:
             return pd.DataFrame(columns=['date', 'client_name', 'hours', 'notes'])
-        df['date'] = pd.to_datetime(df['date'])
+        df['hours'] = df['hours'].astype(np.float32)
+        # Entries repeat the same few client names; categorical storage
+        # makes the column a small int array plus one label table
+        df['client_name'] = df['client_name'].astype('category')
         return df
     except Exception as e:
         st.error(f"Error loading time entries: {str(e)}")
@@ -73,10 +193,13 @@ def load_time_entries():
 
 def load_invoices():
     try:
-        df = pd.read_csv(INVOICES_FILE)
+        _drain_writes()
+        df = _read_feather_cached(INVOICES_FILE, *_table_mtimes(INVOICES_FILE))
         if df.empty:
             return pd.DataFrame(columns=['date', 'client_name', 'amount', 'type', 'description'])
-        df['date'] = pd.to_datetime(df['date'])
+        df['amount'] = df['amount'].astype(np.float32)
+        df['client_name'] = df['client_name'].astype('category')
+        df['type'] = df['type'].astype('category')
         return df
     except Exception as e:
         st.error(f"Error loading invoices: {str(e)}")
@@ -84,7 +207,8 @@ def load_invoices():
 
 def load_settings():
     try:
-        df = pd.read_csv(SETTINGS_FILE)
+        _drain_writes()
+        df = _read_feather_cached(SETTINGS_FILE, os.path.getmtime(SETTINGS_FILE))
         if df.empty:
             return {'monthly_target': 15000.0, 'work_days': 'Monday,Tuesday,Wednesday,Thursday,Friday'}
         return df.iloc[0]
@@ -94,10 +218,11 @@ def load_settings():
 
 def load_non_work_days():
     try:
-        df = pd.read_csv(NON_WORK_DAYS_FILE)
+        _drain_writes()
+        df = _read_feather_cached(NON_WORK_DAYS_FILE, *_table_mtimes(NON_WORK_DAYS_FILE))
         if df.empty:
             return pd.DataFrame(columns=['date', 'reason'])
-        df['date'] = pd.to_datetime(df['date']).dt.date
+        # Keep dates as datetime64[ns]; comparison sites use pd.Timestamp
         return df
     except Exception as e:
         st.error(f"Error loading non-work days: {str(e)}")
@@ -105,29 +230,101 @@ def load_non_work_days():
 
 # Save data
 def save_clients(df):
-    df.to_csv(CLIENTS_FILE, index=False)
+    _write_feather(df, CLIENTS_FILE)
+    _read_feather_cached.clear()
 
 def save_time_entries(df):
-    df.to_csv(TIME_ENTRIES_FILE, index=False)
+    _write_feather(df, TIME_ENTRIES_FILE)
+    _read_feather_cached.clear()
 
 def save_invoices(df):
-    df.to_csv(INVOICES_FILE, index=False)
+    _write_feather(df, INVOICES_FILE)
+    _read_feather_cached.clear()
+
+def append_time_entry(row):
+    """Fast path for adding one time entry; see _append_row."""
+    _append_row(TIME_ENTRIES_FILE, row)
+
+def append_invoice(row):
+    """Fast path for adding one invoice; see _append_row."""
+    _append_row(INVOICES_FILE, row)
+
+def append_client(row):
+    """Fast path for adding one client; see _append_row."""
+    _append_row(CLIENTS_FILE, row)
+
+def append_non_work_day(row):
+    """Fast path for marking one non-work day; see _append_row."""
+    _append_row(NON_WORK_DAYS_FILE, row)
 
 def save_settings(monthly_target, work_days):
-    pd.DataFrame({'monthly_target': [monthly_target], 'work_days': [','.join(work_days)]}).to_csv(SETTINGS_FILE, index=False)
+    _write_feather(pd.DataFrame({'monthly_target': [monthly_target], 'work_days': [','.join(work_days)]}), SETTINGS_FILE)
+    _read_feather_cached.clear()
 
 def save_non_work_days(df):
-    df.to_csv(NON_WORK_DAYS_FILE, index=False)
+    _write_feather(df, NON_WORK_DAYS_FILE)
+    _read_feather_cached.clear()
+
+# Month metadata, memoized - the same (year, month) is looked up many
+# times per render across the stats, dashboard and calendar code paths
+@lru_cache(maxsize=256)
+def _monthrange(year, month):
+    return calendar.monthrange(year, month)
+
+@lru_cache(maxsize=256)
+def _month_bounds(year, month):
+    return datetime(year, month, 1), datetime(year, month, _monthrange(year, month)[1])
+
+def _month_slice(df, year, month):
+    """Rows of a date-sorted frame falling in the given month.
+
+    Binary search over the sorted 'date' column - O(log N) instead of a
+    boolean scan of the whole history. Loaders keep the dated tables
+    sorted, so callers only need to re-sort frames they build themselves.
+    """
+    if df.empty:
+        return df
+    month_start, _ = _month_bounds(year, month)
+    next_month_start = _month_bounds(*((year + 1, 1) if month == 12 else (year, month + 1)))[0]
+    lo = df['date'].searchsorted(month_start, side='left')
+    hi = df['date'].searchsorted(next_month_start, side='left')
+    return df.iloc[lo:hi]
+
+# Client name lists, cached per clients-table version so the filter,
+# tolist and sort don't rerun on every widget interaction
+@st.cache_data(show_spinner=False)
+def _active_client_names(clients_df):
+    if clients_df.empty:
+        return []
+    return sorted(clients_df.loc[clients_df['active'] == True, 'client_name'].tolist())
+
+@st.cache_data(show_spinner=False)
+def _active_hourly_client_names(clients_df):
+    if clients_df.empty:
+        return []
+    mask = (clients_df['active'] == True) & (clients_df['billing_type'] == 'Hourly')
+    return sorted(clients_df.loc[mask, 'client_name'].tolist())
 
 # Calculate client hours
-def calculate_client_hours(client_name, time_entries_df, limit_type, contract_start_date=None, year=None, month=None):
-    """Calculate hours used for a client based on their limit type"""
+def group_entries_by_client(time_entries_df):
+    """Group time entries by client so per-client lookups are hash hits."""
     if time_entries_df.empty:
+        return None
+    # observed=True keeps unused categorical client names out of the groups
+    return time_entries_df.groupby('client_name', sort=False, observed=True)
+
+def calculate_client_hours(client_name, entries_by_client, limit_type, contract_start_date=None, year=None, month=None):
+    """Calculate hours used for a client based on their limit type.
+
+    entries_by_client is the GroupBy from group_entries_by_client (or None),
+    so looking up one client doesn't rescan the whole entries table.
+    """
+    if entries_by_client is None:
         return 0
-    
-    client_entries = time_entries_df[time_entries_df['client_name'] == client_name]
-    
-    if client_entries.empty:
+
+    try:
+        client_entries = entries_by_client.get_group(client_name)
+    except KeyError:
         return 0
     
     # If limit_type is None or empty, default to Monthly calculation
@@ -141,8 +338,7 @@ def calculate_client_hours(client_name, time_entries_df, limit_type, contract_st
             year = now.year
             month = now.month
         
-        month_start = datetime(year, month, 1)
-        month_end = datetime(year, month, calendar.monthrange(year, month)[1])
+        month_start, month_end = _month_bounds(year, month)
         month_entries = client_entries[(client_entries['date'] >= month_start) & (client_entries['date'] <= month_end)]
         return month_entries['hours'].sum()
     
@@ -165,59 +361,100 @@ def calculate_client_hours(client_name, time_entries_df, limit_type, contract_st
         year = now.year
         month = now.month
     
-    month_start = datetime(year, month, 1)
-    month_end = datetime(year, month, calendar.monthrange(year, month)[1])
+    month_start, month_end = _month_bounds(year, month)
     month_entries = client_entries[(client_entries['date'] >= month_start) & (client_entries['date'] <= month_end)]
     return month_entries['hours'].sum()
 
+def _client_limits_table(clients_with_limits, entries_by_client, year, month):
+    """Build the hour-limits display table with vectorized column ops.
+
+    Hours used still go through calculate_client_hours (limit type and
+    contract start vary per client), but everything else - remaining,
+    percentage, status and the display formatting - is computed on whole
+    columns instead of row-by-row.
+    """
+    hours_used = np.array([
+        calculate_client_hours(client.client_name, entries_by_client, client.limit_type,
+                               client.contract_start_date, year, month)
+        for client in clients_with_limits.itertuples()
+    ], dtype=float)
+    limits = clients_with_limits['hour_limit'].to_numpy(dtype=float)
+    percentage_used = np.where(limits > 0, hours_used / np.where(limits > 0, limits, 1) * 100, 0)
+    status = np.select([percentage_used >= 90, percentage_used >= 75],
+                       ['🔴 Critical', '🟡 Warning'], default='🟢 Good')
+
+    return pd.DataFrame({
+        'Client': clients_with_limits['client_name'].to_numpy(),
+        'Limit Type': clients_with_limits['limit_type'].to_numpy(),
+        'Total Limit': pd.Series(limits).map('{:.1f} hrs'.format),
+        'Hours Used': pd.Series(hours_used).map('{:.1f} hrs'.format),
+        'Hours Remaining': pd.Series(limits - hours_used).map('{:.1f} hrs'.format),
+        'Usage %': pd.Series(percentage_used).map('{:.1f}%'.format),
+        'Status': status
+    })
+
 # Calculate metrics
-def is_work_day(date, work_days_list, non_work_days_df):
-    if calendar.day_name[date.weekday()] not in work_days_list:
-        return False
-    
+WEEKDAY_TO_INT = {name: i for i, name in enumerate(calendar.day_name)}
+
+def _workday_mask(year, month, work_days, non_work_days_df):
+    """Vectorized work-day test for a whole month.
+
+    Returns (days, mask) where days is a daily DatetimeIndex covering the
+    month and mask is a boolean array that is True on work days.
+    """
+    days = pd.date_range(datetime(year, month, 1), periods=_monthrange(year, month)[1], freq='D')
+    work_ints = np.array([WEEKDAY_TO_INT[d] for d in work_days if d in WEEKDAY_TO_INT])
+    mask = np.isin(days.dayofweek, work_ints)
     if not non_work_days_df.empty:
-        if date in non_work_days_df['date'].values:
-            return False
-    
-    return True
+        mask &= ~days.isin(pd.DatetimeIndex(non_work_days_df['date']).normalize())
+    return days, mask
 
 def get_work_days_in_month(year, month, work_days, non_work_days_df):
-    days_in_month = calendar.monthrange(year, month)[1]
-    work_day_names = work_days
-    work_days_count = 0
-    
-    for day in range(1, days_in_month + 1):
-        date = datetime(year, month, day).date()
-        if is_work_day(date, work_day_names, non_work_days_df):
-            work_days_count += 1
-    
-    return work_days_count
+    _, mask = _workday_mask(year, month, work_days, non_work_days_df)
+    return int(mask.sum())
+
+@st.cache_data(show_spinner=False)
+def _enrich_time_entries(time_entries_df, clients_df):
+    """Return the entries with precomputed 'rate', 'income' and
+    'billing_type' columns.
+
+    The rate lookup and multiplication happen once per (entries, clients)
+    pair instead of being re-merged by every consumer; 'rate' is NaN for
+    entries whose client is not billed hourly, so their income is 0.
+    """
+    df = time_entries_df.copy()
+    hourly_clients = clients_df[clients_df['billing_type'] == 'Hourly'] if not clients_df.empty else pd.DataFrame()
+    rate_map = dict(zip(hourly_clients['client_name'], hourly_clients['hourly_rate'])) if not hourly_clients.empty else {}
+    billing_map = dict(zip(clients_df['client_name'], clients_df['billing_type'])) if not clients_df.empty else {}
+    # client_name is categorical and .map on a categorical returns a
+    # Categorical whenever the mapped values are unique, which would make
+    # these columns' dtype depend on the data (and break the income
+    # multiply below) - force numeric/object results explicitly
+    df['rate'] = pd.to_numeric(df['client_name'].map(rate_map), errors='coerce') if not df.empty else 0.0
+    df['income'] = (df['hours'] * df['rate']).fillna(0) if not df.empty else 0.0
+    df['billing_type'] = df['client_name'].astype(object).map(billing_map) if not df.empty else None
+    return df
 
 def calculate_monthly_stats(year, month, clients_df, time_entries_df, invoices_df, settings, non_work_days_df):
-    month_start = datetime(year, month, 1)
-    month_end = datetime(year, month, calendar.monthrange(year, month)[1])
-    
-    # Filter data for the month
-    monthly_entries = time_entries_df[
-        (time_entries_df['date'] >= month_start) & 
-        (time_entries_df['date'] <= month_end)
-    ] if not time_entries_df.empty else pd.DataFrame()
-    
-    monthly_invoices = invoices_df[
-        (invoices_df['date'] >= month_start) & 
-        (invoices_df['date'] <= month_end)
-    ] if not invoices_df.empty else pd.DataFrame()
+    # Thin wrapper so the cached helper is keyed on plain values plus
+    # today's date (days_worked changes at midnight, not on rerun)
+    return _monthly_stats_cached(year, month, clients_df, time_entries_df, invoices_df,
+                                 float(settings['monthly_target']), settings['work_days'],
+                                 non_work_days_df, datetime.now().date())
+
+@st.cache_data(show_spinner=False)
+def _monthly_stats_cached(year, month, clients_df, time_entries_df, invoices_df, monthly_target, work_days, non_work_days_df, today):
+    # Filter data for the month (date-sorted, so this is a binary search)
+    monthly_entries = _month_slice(time_entries_df, year, month)
+    monthly_invoices = _month_slice(invoices_df, year, month)
     
     # Calculate hourly billables (only for hourly clients)
     hourly_total = 0
     total_hours = 0
     if not monthly_entries.empty and not clients_df.empty:
-        hourly_clients = clients_df[clients_df['billing_type'] == 'Hourly']
-        if not hourly_clients.empty:
-            merged = monthly_entries.merge(hourly_clients[['client_name', 'hourly_rate']], on='client_name', how='inner')
-            if not merged.empty:
-                hourly_total = (merged['hours'] * merged['hourly_rate']).sum()
-                total_hours = merged['hours'].sum()
+        enriched = _enrich_time_entries(monthly_entries, clients_df)
+        hourly_total = enriched['income'].sum()
+        total_hours = enriched.loc[enriched['rate'].notna(), 'hours'].sum()
     
     # Add retainer/flat fee income
     retainer_total = 0
@@ -226,18 +463,20 @@ def calculate_monthly_stats(year, month, clients_df, time_entries_df, invoices_d
     
     total_income = hourly_total + retainer_total
     
-    work_days_list = settings['work_days'].split(',')
-    total_work_days = get_work_days_in_month(year, month, work_days_list, non_work_days_df)
-    
-    # Calculate days worked so far
-    today = datetime.now().date()
-    days_worked = 0
-    for day in range(1, min(today.day + 1, calendar.monthrange(year, month)[1] + 1)):
-        date = datetime(year, month, day).date()
-        if is_work_day(date, work_days_list, non_work_days_df) and date <= today:
-            days_worked += 1
-    
-    daily_target = settings['monthly_target'] / total_work_days if total_work_days > 0 else 0
+    work_days_list = work_days.split(',')
+    _, workday_mask = _workday_mask(year, month, work_days_list, non_work_days_df)
+    total_work_days = int(workday_mask.sum())
+
+    # Calculate days worked so far: the whole month if it is already
+    # over, none of it if it has not started, else up to today
+    if (year, month) == (today.year, today.month):
+        days_worked = int(workday_mask[:today.day].sum())
+    elif (year, month) < (today.year, today.month):
+        days_worked = total_work_days
+    else:
+        days_worked = 0
+
+    daily_target = monthly_target / total_work_days if total_work_days > 0 else 0
     target_so_far = daily_target * days_worked
     
     # Calculate average hourly rate from hourly clients
@@ -254,7 +493,7 @@ def calculate_monthly_stats(year, month, clients_df, time_entries_df, invoices_d
         'total_income': total_income,
         'hourly_income': hourly_total,
         'retainer_income': retainer_total,
-        'monthly_target': settings['monthly_target'],
+        'monthly_target': monthly_target,
         'target_so_far': target_so_far,
         'daily_target': daily_target,
         'daily_hours_target': daily_hours_target,
@@ -264,6 +503,45 @@ def calculate_monthly_stats(year, month, clients_df, time_entries_df, invoices_d
         'avg_hourly_rate': avg_hourly_rate
     }
 
+def _cum_targets_actuals(workday_mask, daily_target, daily_actual):
+    """Cumulative reduce over the per-day arrays.
+
+    Both reductions are single numpy cumsums, i.e. already compiled C
+    loops; a JIT would only add compile latency here, so this stays
+    plain numpy even for multi-year ranges.
+    """
+    targets = (workday_mask * daily_target).cumsum()
+    actuals = daily_actual.cumsum()
+    return targets, actuals
+
+@st.cache_data(show_spinner=False)
+def _build_targets_actuals(year, month, clients_df, time_entries_df, invoices_df, non_work_days_df, daily_target, work_days):
+    """Cumulative target and actual income arrays for one month's chart.
+
+    Cached on the input frames so unrelated widget interactions reuse the
+    computed arrays instead of redoing the groupbys.
+    """
+    work_days_list = work_days.split(',')
+
+    # Vectorized cumulative target/actual series - two groupbys replace the
+    # old day-by-day filter loop over the whole month
+    dates, workday_mask = _workday_mask(year, month, work_days_list, non_work_days_df)
+
+    daily_actual = np.zeros(len(dates))
+    if not time_entries_df.empty:
+        # Hourly income per day from the precomputed income column
+        enriched = _enrich_time_entries(time_entries_df, clients_df)
+        income_by_day = enriched.groupby(enriched['date'].dt.normalize())['income'].sum()
+        daily_actual += income_by_day.reindex(dates, fill_value=0).to_numpy()
+
+    # Add retainer/flat fee income
+    if not invoices_df.empty:
+        invoices_by_day = invoices_df.groupby(invoices_df['date'].dt.normalize())['amount'].sum()
+        daily_actual += invoices_by_day.reindex(dates, fill_value=0).to_numpy()
+
+    targets, actuals = _cum_targets_actuals(workday_mask, daily_target, daily_actual)
+    return dates, targets, actuals
+
 def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_days_df):
     st.header("📊 Dashboard")
     
@@ -303,42 +581,10 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
     st.markdown("---")
     st.subheader("Target vs Actuals")
     
-    work_days_list = settings['work_days'].split(',')
-    
-    dates = []
-    targets = []
-    actuals = []
-    cumulative_actual = 0
-    cumulative_target = 0
-    
-    for day in range(1, calendar.monthrange(selected_year, selected_month)[1] + 1):
-        date = datetime(selected_year, selected_month, day)
-        dates.append(date)
-        
-        if is_work_day(date.date(), work_days_list, non_work_days_df):
-            cumulative_target += stats['daily_target']
-        
-        targets.append(cumulative_target)
-        
-        # Calculate actual income up to this date (hourly only)
-        if not time_entries_df.empty and not clients_df.empty:
-            daily_entries = time_entries_df[time_entries_df['date'].dt.date == date.date()]
-            if not daily_entries.empty:
-                hourly_clients = clients_df[clients_df['billing_type'] == 'Hourly']
-                if not hourly_clients.empty:
-                    merged = daily_entries.merge(hourly_clients[['client_name', 'hourly_rate']], on='client_name', how='inner')
-                    if not merged.empty:
-                        daily_income = (merged['hours'] * merged['hourly_rate']).sum()
-                        cumulative_actual += daily_income
-        
-        # Add retainer/flat fee income
-        if not invoices_df.empty:
-            daily_invoices = invoices_df[invoices_df['date'].dt.date == date.date()]
-            if not daily_invoices.empty:
-                cumulative_actual += daily_invoices['amount'].sum()
-        
-        actuals.append(cumulative_actual)
-    
+    dates, targets, actuals = _build_targets_actuals(
+        selected_year, selected_month, clients_df, time_entries_df, invoices_df,
+        non_work_days_df, stats['daily_target'], settings['work_days'])
+
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=dates, y=targets, mode='lines', name='Target', line=dict(color='red', width=2)))
     fig.add_trace(go.Scatter(x=dates, y=actuals, mode='lines', name='Actuals', line=dict(color='blue', width=2)))
@@ -346,8 +592,9 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
     # Add vertical line for today's date - use midnight to align with gridlines
     today = datetime.now()
     today_midnight = datetime(today.year, today.month, today.day)
-    if datetime(selected_year, selected_month, 1) <= today <= datetime(selected_year, selected_month, calendar.monthrange(selected_year, selected_month)[1], 23, 59, 59):
-        max_y = max(max(targets), max(actuals)) if actuals else max(targets)
+    month_start_dt, month_end_dt = _month_bounds(selected_year, selected_month)
+    if month_start_dt <= today_midnight <= month_end_dt:
+        max_y = max(targets.max(), actuals.max())
         fig.add_trace(go.Scatter(
             x=[today_midnight, today_midnight],
             y=[0, max_y * 1.1],
@@ -356,7 +603,7 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
             name='Today',
             showlegend=True
         ))
-    
+
     fig.update_layout(
         xaxis_title="Date",
         yaxis_title="Amount ($)",
@@ -386,44 +633,9 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
         clients_with_limits = clients_df[(clients_df['has_hour_limit'] == True) & (clients_df['active'] == True)]
         
         if not clients_with_limits.empty:
-            limit_data = []
-            
-            for _, client in clients_with_limits.iterrows():
-                hours_used = calculate_client_hours(
-                    client['client_name'], 
-                    time_entries_df, 
-                    client['limit_type'],
-                    client['contract_start_date'],
-                    selected_year,
-                    selected_month
-                )
-                
-                hours_remaining = client['hour_limit'] - hours_used
-                percentage_used = (hours_used / client['hour_limit'] * 100) if client['hour_limit'] > 0 else 0
-                
-                # Determine status color
-                if percentage_used >= 90:
-                    status = "🔴 Critical"
-                elif percentage_used >= 75:
-                    status = "🟡 Warning"
-                else:
-                    status = "🟢 Good"
-                
-                limit_data.append({
-                    'Client': client['client_name'],
-                    'Limit Type': client['limit_type'],
-                    'Total Limit': f"{client['hour_limit']:.1f} hrs",
-                    'Hours Used': f"{hours_used:.1f} hrs",
-                    'Hours Remaining': f"{hours_remaining:.1f} hrs",
-                    'Usage %': f"{percentage_used:.1f}%",
-                    'Status': status
-                })
-            
-            if limit_data:
-                limit_df = pd.DataFrame(limit_data)
-                st.dataframe(limit_df, width='stretch', hide_index=True)
-            else:
-                st.info("No clients with hour limits have been used yet.")
+            entries_by_client = group_entries_by_client(time_entries_df)
+            limit_df = _client_limits_table(clients_with_limits, entries_by_client, selected_year, selected_month)
+            st.table(limit_df.style.hide(axis='index'))
         else:
             st.info("No clients have hour limits set. Configure limits in Client Management.")
     
@@ -431,54 +643,41 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
     st.markdown("---")
     st.subheader("Monthly Breakdown by Client")
     
-    month_start = datetime(selected_year, selected_month, 1)
-    month_end = datetime(selected_year, selected_month, calendar.monthrange(selected_year, selected_month)[1])
-    
-    # Create breakdown table
-    breakdown_data = []
-    
+    # Create breakdown table (column assignments instead of per-row iterrows dicts)
+    breakdown_frames = []
+
     # Hourly clients
-    monthly_entries = time_entries_df[
-        (time_entries_df['date'] >= month_start) & 
-        (time_entries_df['date'] <= month_end)
-    ] if not time_entries_df.empty else pd.DataFrame()
-    
+    monthly_entries = _month_slice(time_entries_df, selected_year, selected_month)
+
     if not monthly_entries.empty and not clients_df.empty:
         hourly_clients = clients_df[clients_df['billing_type'] == 'Hourly']
         if not hourly_clients.empty:
-            hourly_breakdown = monthly_entries.groupby('client_name')['hours'].sum().reset_index()
+            hourly_breakdown = monthly_entries.groupby('client_name', observed=True)['hours'].sum().reset_index()
             hourly_breakdown = hourly_breakdown.merge(hourly_clients[['client_name', 'hourly_rate']], on='client_name', how='inner')
             if not hourly_breakdown.empty:
-                hourly_breakdown['total_invoice'] = hourly_breakdown['hours'] * hourly_breakdown['hourly_rate']
-                hourly_breakdown['billing_type'] = 'Hourly'
-                for _, row in hourly_breakdown.iterrows():
-                    breakdown_data.append({
-                        'Client': row['client_name'],
-                        'Billing Type': 'Hourly',
-                        'Hours': row['hours'],
-                        'Rate': row['hourly_rate'],
-                        'Total Invoice': row['total_invoice']
-                    })
-    
+                breakdown_frames.append(pd.DataFrame({
+                    'Client': hourly_breakdown['client_name'],
+                    'Billing Type': 'Hourly',
+                    'Hours': hourly_breakdown['hours'],
+                    'Rate': hourly_breakdown['hourly_rate'],
+                    'Total Invoice': hourly_breakdown['hours'] * hourly_breakdown['hourly_rate']
+                }))
+
     # Retainer/Flat fee clients
-    monthly_invoices = invoices_df[
-        (invoices_df['date'] >= month_start) & 
-        (invoices_df['date'] <= month_end)
-    ] if not invoices_df.empty else pd.DataFrame()
-    
+    monthly_invoices = _month_slice(invoices_df, selected_year, selected_month)
+
     if not monthly_invoices.empty:
-        retainer_breakdown = monthly_invoices.groupby('client_name')['amount'].sum().reset_index()
-        for _, row in retainer_breakdown.iterrows():
-            breakdown_data.append({
-                'Client': row['client_name'],
-                'Billing Type': 'Retainer/Flat Fee',
-                'Hours': 0,
-                'Rate': 0,
-                'Total Invoice': row['amount']
-            })
-    
-    if breakdown_data:
-        breakdown_df = pd.DataFrame(breakdown_data)
+        retainer_breakdown = monthly_invoices.groupby('client_name', observed=True)['amount'].sum().reset_index()
+        breakdown_frames.append(pd.DataFrame({
+            'Client': retainer_breakdown['client_name'],
+            'Billing Type': 'Retainer/Flat Fee',
+            'Hours': 0.0,
+            'Rate': 0.0,
+            'Total Invoice': retainer_breakdown['amount']
+        }))
+
+    if breakdown_frames:
+        breakdown_df = pd.concat(breakdown_frames, ignore_index=True)
         st.dataframe(breakdown_df.style.format({
             'Hours': '{:.2f}',
             'Rate': '${:.2f}',
@@ -497,8 +696,7 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
     st.subheader("Weekly Breakdown by Client")
     
     # Generate all weeks in the selected month
-    month_start = datetime(selected_year, selected_month, 1)
-    month_end = datetime(selected_year, selected_month, calendar.monthrange(selected_year, selected_month)[1])
+    month_start, month_end = _month_bounds(selected_year, selected_month)
     
     # Find all Monday-starting weeks that overlap with this month
     all_weeks = []
@@ -517,32 +715,21 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
         current_date += timedelta(days=7)
     
     # Get active clients
-    if not clients_df.empty:
-        active_clients = sorted(clients_df[clients_df['active'] == True]['client_name'].tolist())
-    else:
-        active_clients = []
+    active_clients = _active_client_names(clients_df)
     
     if active_clients and all_weeks:
-        # Create pivot data structure - initialize with zeros for all clients and weeks
-        pivot_data = {}
-        for client_name in active_clients:
-            pivot_data[client_name] = {week: 0 for week in all_weeks}
-        
-        # Fill in actual hours from time entries
+        # One pivot_table replaces the old client x week nested filter loops
+        week_index = pd.DatetimeIndex(all_weeks)
         if not monthly_entries.empty:
-            monthly_entries_copy = monthly_entries.copy()
-            monthly_entries_copy['week_start'] = monthly_entries_copy['date'].dt.to_period('W').apply(lambda r: r.start_time)
-            
-            for client_name in monthly_entries_copy['client_name'].unique():
-                if client_name in pivot_data:  # Only include active clients
-                    client_entries = monthly_entries_copy[monthly_entries_copy['client_name'] == client_name]
-                    
-                    # Sum hours for each week
-                    for week_start in all_weeks:
-                        week_entries = client_entries[client_entries['week_start'] == week_start]
-                        if not week_entries.empty:
-                            pivot_data[client_name][week_start] = week_entries['hours'].sum()
-        
+            # Pass the week-start Series straight to pivot_table as the column
+            # grouper - no intermediate copy of the monthly entries
+            week_start = monthly_entries['date'].dt.to_period('W').dt.start_time.rename('week_start')
+            pivot = monthly_entries.pivot_table(index='client_name', columns=week_start, values='hours', aggfunc='sum', fill_value=0, observed=True)
+            # Zero-fill missing active clients/weeks, drop inactive clients
+            pivot = pivot.reindex(index=active_clients, columns=week_index, fill_value=0).fillna(0)
+        else:
+            pivot = pd.DataFrame(0.0, index=active_clients, columns=week_index)
+
         # Create column headers with week ranges
         week_columns = []
         for week_start in all_weeks:
@@ -555,28 +742,68 @@ def show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_
             else:
                 display_start = week_start
             week_columns.append(f"{display_start.strftime('%b %d')}-{week_end.strftime('%d')}")
-        
-        # Build rows
-        table_rows = []
-        for client_name in active_clients:
-            row = {'Client': client_name}
-            total_hours = 0
-            
-            for i, week_start in enumerate(all_weeks):
-                hours = pivot_data[client_name][week_start]
-                total_hours += hours
-                # Display "-" for zero hours, otherwise show hours
-                row[week_columns[i]] = f"{hours:.1f}" if hours > 0 else "-"
-            
-            row['Total'] = f"{total_hours:.1f}"
-            table_rows.append(row)
-        
-        # Create DataFrame and display
-        weekly_pivot_df = pd.DataFrame(table_rows)
+
+        # Format for display: "-" for zero hours, one decimal otherwise
+        totals = pivot.sum(axis=1)
+        weekly_pivot_df = pivot.map(lambda hours: f"{hours:.1f}" if hours > 0 else "-")
+        weekly_pivot_df.columns = week_columns
+        weekly_pivot_df.insert(0, 'Client', weekly_pivot_df.index)
+        weekly_pivot_df['Total'] = totals.map('{:.1f}'.format)
         st.dataframe(weekly_pivot_df, use_container_width=True, hide_index=True)
     else:
         st.info("No active clients or weeks available.")
 
+# Calendar grid styling, built once at import time instead of per render
+_CALENDAR_CSS = """
+<style>
+table.calendar-grid {
+    width: 100%;
+    border-collapse: separate;
+    border-spacing: 0.25rem;
+    table-layout: fixed;
+}
+table.calendar-grid th {
+    text-align: center;
+    padding: 0.25rem;
+}
+table.calendar-grid td {
+    padding: 0;
+}
+.calendar-button {
+    display: block;
+    width: 100%;
+    padding: 0.5rem 0.75rem;
+    text-align: center;
+    border-radius: 0.5rem;
+    border: 1px solid;
+    background-color: white !important;
+    cursor: default;
+    font-size: 1rem;
+    font-weight: 400;
+    line-height: 1.6;
+    margin: 0;
+    box-sizing: border-box;
+    text-decoration: none;
+}
+a.calendar-button {
+    cursor: pointer;
+}
+.work-day {
+    color: #28a745;
+    border-color: #28a745;
+}
+.holiday {
+    color: #6c757d;
+    border-color: #6c757d;
+}
+.non-work {
+    color: #dc3545;
+    border-color: #ddd;
+    cursor: default;
+}
+</style>
+"""
+
 def show_calendar_manager(non_work_days_df, settings):
     st.header("📅 Work Calendar")
     
@@ -605,164 +832,83 @@ def show_calendar_manager(non_work_days_df, settings):
     
     # Get month calendar
     cal = calendar.monthcalendar(selected_year, selected_month)
-    
+
     # Display calendar
     st.markdown("### " + calendar.month_name[selected_month] + f" {selected_year}")
-    
-    # Day headers
-    cols = st.columns(7)
+
+    # Custom CSS for calendar styling - one shared block for the whole grid
+    st.markdown(_CALENDAR_CSS, unsafe_allow_html=True)
+
+    # Render the whole grid as one static HTML table - a single markdown
+    # call instead of ~35 column/button widgets per render. Clickable days
+    # are links whose ?toggle= query param is handled in main().
+    marked_reasons = {}
+    if not non_work_days_df.empty:
+        marked_reasons = dict(zip(non_work_days_df['date'].dt.normalize(), non_work_days_df['reason']))
+
     day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    for i, col in enumerate(cols):
-        col.markdown(f"**{day_names[i]}**")
-    
-    # Custom CSS for calendar styling
-    st.markdown("""
-    <style>
-    .calendar-button {
-        width: 100%;
-        padding: 0.5rem 0.75rem;
-        text-align: center;
-        border-radius: 0.5rem;
-        border: 1px solid;
-        background-color: white !important;
-        cursor: default;
-        font-size: 1rem;
-        font-weight: 400;
-        line-height: 1.6;
-        margin: 0;
-        box-sizing: border-box;
-    }
-    .work-day {
-        color: #28a745;
-        border-color: #28a745;
-    }
-    .holiday {
-        color: #6c757d;
-        border-color: #6c757d;
-    }
-    .non-work {
-        color: #dc3545;
-        border-color: #ddd;
-        cursor: default;
-    }
-    /* Ensure all column divs have same styling */
-    div[data-testid="column"] > div > div {
-        margin: 0 !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Calendar grid with session state for clicks
-    if 'calendar_click' not in st.session_state:
-        st.session_state.calendar_click = None
-    
-    # Calendar grid
+    header_cells = ''.join(f"<th>{name}</th>" for name in day_names)
+    body_rows = []
     for week in cal:
-        cols = st.columns(7)
-        for i, day in enumerate(week):
+        cells = []
+        for day in week:
             if day == 0:
-                cols[i].write("")
+                cells.append("<td></td>")
             else:
-                date = datetime(selected_year, selected_month, day).date()
+                date = pd.Timestamp(selected_year, selected_month, day)
                 day_name = calendar.day_name[date.weekday()]
-                
-                # Check if this is a regular work day
-                is_regular_work_day = day_name in work_days_list
-                
-                # Check if this day is marked as non-work day (holiday/vacation)
-                is_marked_non_work = False
-                reason = ""
-                if not non_work_days_df.empty:
-                    day_record = non_work_days_df[non_work_days_df['date'] == date]
-                    if not day_record.empty:
-                        is_marked_non_work = True
-                        reason = day_record.iloc[0]['reason']
-                
-                # Determine button appearance
-                if not is_regular_work_day:
-                    # Weekend or regular non-work day - red text on white background, not clickable
-                    label = f"🔴 {day}"
-                    cols[i].markdown(f"<div class='calendar-button non-work'>{label}</div>", unsafe_allow_html=True)
-                elif is_marked_non_work:
-                    # Marked as holiday/vacation - gray button, clickable
-                    label = f"⚫ {day}"
-                    # Use custom styling for white background
-                    cols[i].markdown(f"""
-                    <style>
-                    button[key="day_{selected_year}_{selected_month}_{day}"] {{
-                        background-color: white !important;
-                        color: #6c757d !important;
-                        border: 2px solid #6c757d !important;
-                    }}
-                    </style>
-                    """, unsafe_allow_html=True)
-                    if cols[i].button(label, key=f"day_{selected_year}_{selected_month}_{day}", use_container_width=True):
-                        # Remove from non-work days
-                        non_work_days_df = non_work_days_df[non_work_days_df['date'] != date]
-                        save_non_work_days(non_work_days_df)
-                        st.rerun()
+                href = f"?toggle={date.date().isoformat()}"
+
+                if day_name not in work_days_list:
+                    # Weekend or regular non-work day - red, not clickable
+                    cells.append(f"<td><div class='calendar-button non-work'>🔴 {day}</div></td>")
+                elif date in marked_reasons:
+                    # Marked as holiday/vacation - gray, click to restore
+                    cells.append(f"<td><a class='calendar-button holiday' href='{href}' target='_self' title='{marked_reasons[date]}'>⚫ {day}</a></td>")
                 else:
-                    # Regular work day - green button, clickable
-                    label = f"🟢 {day}"
-                    # Use custom styling for white background
-                    cols[i].markdown(f"""
-                    <style>
-                    button[key="day_{selected_year}_{selected_month}_{day}"] {{
-                        background-color: white !important;
-                        color: #28a745 !important;
-                        border: 2px solid #28a745 !important;
-                    }}
-                    </style>
-                    """, unsafe_allow_html=True)
-                    if cols[i].button(label, key=f"day_{selected_year}_{selected_month}_{day}", use_container_width=True):
-                        # Add as non-work day
-                        st.session_state[f'adding_non_work_{date}'] = True
-                        st.rerun()
-    
-    # Handle adding non-work day with reason
-    for key in list(st.session_state.keys()):
-        if key.startswith('adding_non_work_'):
-            date_str = key.replace('adding_non_work_', '')
-            date = datetime.strptime(date_str, '%Y-%m-%d').date()
-            
-            with st.form(f"reason_form_{date}"):
-                st.write(f"**Mark {date.strftime('%B %d, %Y')} as non-work day**")
-                reason = st.text_input("Reason (e.g., Holiday, Vacation, Sick)", value="Holiday")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if st.form_submit_button("Save", type="primary"):
-                        new_row = pd.DataFrame({
-                            'date': [date],
-                            'reason': [reason]
-                        })
-                        updated_df = pd.concat([non_work_days_df, new_row], ignore_index=True)
-                        save_non_work_days(updated_df)
-                        del st.session_state[key]
-                        st.rerun()
-                
-                with col2:
-                    if st.form_submit_button("Cancel"):
-                        del st.session_state[key]
-                        st.rerun()
+                    # Regular work day - green, click to mark as non-work
+                    cells.append(f"<td><a class='calendar-button work-day' href='{href}' target='_self'>🟢 {day}</a></td>")
+        body_rows.append("<tr>" + ''.join(cells) + "</tr>")
+
+    st.markdown(
+        f"<table class='calendar-grid'><thead><tr>{header_cells}</tr></thead><tbody>{''.join(body_rows)}</tbody></table>",
+        unsafe_allow_html=True
+    )
+    
+    # Handle adding non-work days with a reason. Pending dates live in a
+    # single session_state set, so there is no full key scan per rerun.
+    for date in sorted(st.session_state.get('pending_nwd', ())):
+        with st.form(f"reason_form_{date}"):
+            st.write(f"**Mark {date.strftime('%B %d, %Y')} as non-work day**")
+            reason = st.text_input("Reason (e.g., Holiday, Vacation, Sick)", value="Holiday")
+            col1, col2 = st.columns(2)
+
+            with col1:
+                if st.form_submit_button("Save", type="primary"):
+                    append_non_work_day({
+                        'date': date,
+                        'reason': reason
+                    })
+                    st.session_state['pending_nwd'].discard(date)
+                    st.rerun()
+
+            with col2:
+                if st.form_submit_button("Cancel"):
+                    st.session_state['pending_nwd'].discard(date)
+                    st.rerun()
     
     # Show list of non-work days
     st.markdown("---")
     st.subheader("Holidays & Vacation Days This Month")
     
-    month_start = datetime(selected_year, selected_month, 1).date()
-    month_end = datetime(selected_year, selected_month, calendar.monthrange(selected_year, selected_month)[1]).date()
-    
     if not non_work_days_df.empty:
-        month_non_work = non_work_days_df[
-            (non_work_days_df['date'] >= month_start) & 
-            (non_work_days_df['date'] <= month_end)
-        ].sort_values('date')
-        
+        # Loader keeps the table date-sorted, so the slice is already ordered
+        month_non_work = _month_slice(non_work_days_df, selected_year, selected_month)
+
         if not month_non_work.empty:
             display_df = month_non_work.copy()
-            display_df['date'] = display_df['date'].apply(lambda x: x.strftime('%B %d, %Y (%A)'))
-            st.dataframe(display_df, width='stretch', hide_index=True)
+            display_df['date'] = display_df['date'].dt.strftime('%B %d, %Y (%A)')
+            st.table(display_df.style.hide(axis='index'))
         else:
             st.info("No holidays or vacation days marked for this month.")
     else:
@@ -776,7 +922,7 @@ def show_time_entry(clients_df, time_entries_df):
         return
     
     # Show ALL active clients (both hourly and retainer/flat fee) - sorted alphabetically
-    active_clients = sorted(clients_df[clients_df['active'] == True]['client_name'].tolist())
+    active_clients = _active_client_names(clients_df)
     
     if not active_clients:
         st.warning("No active clients. Please activate clients in Client Management.")
@@ -803,8 +949,8 @@ def show_time_entry(clients_df, time_entries_df):
             if client_info['has_hour_limit']:
                 now = datetime.now()
                 current_hours = calculate_client_hours(
-                    client, 
-                    time_entries_df, 
+                    client,
+                    group_entries_by_client(time_entries_df),
                     client_info['limit_type'],
                     client_info['contract_start_date'],
                     now.year,
@@ -819,48 +965,54 @@ def show_time_entry(clients_df, time_entries_df):
         submitted = st.form_submit_button("Add Entry")
         
         if submitted:
-            new_entry = pd.DataFrame({
-                'date': [pd.Timestamp(entry_date)],
-                'client_name': [client],
-                'hours': [hours],
-                'notes': [notes]
+            append_time_entry({
+                'date': entry_date,
+                'client_name': client,
+                'hours': hours,
+                'notes': notes
             })
-            updated_df = pd.concat([time_entries_df, new_entry], ignore_index=True)
-            save_time_entries(updated_df)
             st.success(f"Added {hours} hours for {client} on {entry_date}")
             st.rerun()
     
     # Show recent entries with billing type indicator
     st.subheader("Recent Entries")
     if not time_entries_df.empty:
-        recent = time_entries_df.sort_values('date', ascending=False).head(20).copy()
+        # The cached enriched view already carries billing type and income,
+        # so no per-page merge; nlargest is a partial selection - no full
+        # sort of the history
+        recent = _enrich_time_entries(time_entries_df, clients_df).nlargest(20, 'date')
         recent['date'] = recent['date'].dt.strftime('%Y-%m-%d')
-        
-        # Add billing type and rate info
+
         if not clients_df.empty:
-            recent = recent.merge(
-                clients_df[['client_name', 'billing_type', 'hourly_rate']], 
-                on='client_name', 
-                how='left'
+            # Format billable as string to avoid type conflicts - vectorized
+            # np.where/map instead of a Python apply per row
+            recent['billable'] = np.where(
+                recent['billing_type'] == 'Hourly',
+                recent['income'].map('${:.2f}'.format),
+                'Not billed'
             )
-            # Format billable as string to avoid type conflicts
-            recent['billable'] = recent.apply(
-                lambda row: f"${row['hours'] * row['hourly_rate']:.2f}" if row['billing_type'] == 'Hourly' else 'Not billed',
-                axis=1
-            )
-            recent = recent[['date', 'client_name', 'hours', 'billing_type', 'billable', 'notes']]
-            
-            # Convert all to string to avoid Arrow issues
-            display_recent = recent.copy()
-            display_recent['hours'] = display_recent['hours'].apply(lambda x: f"{x:.2f}")
-            display_recent = display_recent.astype(str)
-            
-            st.dataframe(display_recent, width='stretch', hide_index=True)
+            recent['hours'] = recent['hours'].map('{:.2f}'.format)
+            display_recent = recent[['date', 'client_name', 'hours', 'billing_type', 'billable', 'notes']]
+
+            st.table(display_recent.style.hide(axis='index'))
         else:
-            st.dataframe(recent, width='stretch', hide_index=True)
+            st.table(recent[['date', 'client_name', 'hours', 'notes']].style.hide(axis='index'))
     else:
         st.info("No time entries yet. Add your first entry above!")
 
+def display_dataframe_quickly(df, max_rows=500):
+    """Slice an over-long frame for display behind a start-row slider.
+
+    Sending thousands of rows to the front end bogs the browser down;
+    anything up to max_rows passes through untouched. Returns the view
+    plus its start offset - editor widgets report row positions relative
+    to the view, so callers add the offset back when applying edits.
+    """
+    if len(df) <= max_rows:
+        return df, 0
+    start = st.slider(f"Start row (showing {max_rows} of {len(df)})", 0, len(df) - 1, 0, max_rows)
+    return df.iloc[start:start + max_rows], start
+
 def show_client_management(clients_df):
     st.header("👥 Client Management")
     
@@ -871,12 +1023,14 @@ def show_client_management(clients_df):
             st.info("Edit client information below. Changes save automatically when you click outside the table.")
             
             # Editable view
-            display_df = clients_df[['client_name', 'billing_type', 'hourly_rate', 'has_hour_limit', 'limit_type', 'hour_limit', 'active']].copy()
+            display_df = clients_df[['client_name', 'billing_type', 'hourly_rate', 'has_hour_limit', 'limit_type', 'hour_limit', 'active']]
+            display_df, editor_offset = display_dataframe_quickly(display_df)
             
-            edited_df = st.data_editor(
+            st.data_editor(
                 display_df,
                 hide_index=True,
                 width='stretch',
+                key='clients_editor',
                 column_config={
                     "client_name": "Client Name",
                     "billing_type": st.column_config.SelectboxColumn("Billing Type", options=["Hourly", "Retainer/Flat Fee"]),
@@ -888,11 +1042,14 @@ def show_client_management(clients_df):
                 },
                 disabled=["client_name"]  # Don't allow changing client names
             )
-            
+
             if st.button("💾 Save Changes"):
-                # Merge changes back into full dataframe
-                for col in edited_df.columns:
-                    clients_df[col] = edited_df[col]
+                # Apply only the edited cells from the editor's delta
+                # instead of copying every column back over the frame
+                edited_rows = st.session_state['clients_editor']['edited_rows']
+                for row_pos, changes in edited_rows.items():
+                    for col, val in changes.items():
+                        clients_df.iloc[editor_offset + row_pos, clients_df.columns.get_loc(col)] = val
                 save_clients(clients_df)
                 st.success("Client changes saved!")
                 st.rerun()
@@ -958,19 +1115,16 @@ def show_client_management(clients_df):
                     # Save the client
                     final_start_date = contract_start_date.strftime('%Y-%m-%d')
                     
-                    new_client = pd.DataFrame({
-                        'client_name': [client_name],
-                        'hourly_rate': [float(hourly_rate)],
-                        'billing_type': [billing_type],
-                        'active': [True],
-                        'has_hour_limit': [has_hour_limit],
-                        'limit_type': [limit_type if has_hour_limit else 'None'],
-                        'hour_limit': [float(hour_limit) if has_hour_limit else 0.0],
-                        'contract_start_date': [final_start_date]
+                    append_client({
+                        'client_name': client_name,
+                        'hourly_rate': float(hourly_rate),
+                        'billing_type': billing_type,
+                        'active': True,
+                        'has_hour_limit': has_hour_limit,
+                        'limit_type': limit_type if has_hour_limit else 'None',
+                        'hour_limit': float(hour_limit) if has_hour_limit else 0.0,
+                        'contract_start_date': final_start_date
                     })
-                    
-                    updated_df = pd.concat([clients_df, new_client], ignore_index=True)
-                    save_clients(updated_df)
                     st.success(f"✅ Added client: {client_name}")
                     st.rerun()
 
@@ -1000,15 +1154,13 @@ def show_invoices(invoices_df, clients_df):
         
         if submitted:
             if client_name and amount > 0:
-                new_invoice = pd.DataFrame({
-                    'date': [pd.Timestamp(invoice_date)],
-                    'client_name': [client_name],
-                    'amount': [amount],
-                    'type': [income_type],
-                    'description': [description]
+                append_invoice({
+                    'date': invoice_date,
+                    'client_name': client_name,
+                    'amount': amount,
+                    'type': income_type,
+                    'description': description
                 })
-                updated_df = pd.concat([invoices_df, new_invoice], ignore_index=True)
-                save_invoices(updated_df)
                 st.success(f"Added ${amount} income from {client_name}")
                 st.rerun()
             else:
@@ -1016,7 +1168,7 @@ def show_invoices(invoices_df, clients_df):
     
     st.subheader("Recent Income")
     if not invoices_df.empty:
-        recent = invoices_df.sort_values('date', ascending=False).head(20).copy()
+        recent = invoices_df.nlargest(20, 'date')
         recent['date'] = recent['date'].dt.strftime('%Y-%m-%d')
         st.dataframe(recent.style.format({'amount': '${:.2f}'}), width='stretch')
     else:
@@ -1043,6 +1195,25 @@ def show_settings(settings):
         else:
             st.error("Please select at least one work day")
 
+# Scenario rows live in session state as a list of dicts; these cached
+# views are keyed on that (small) list's contents, so reruns that don't
+# add or clear scenario rows reuse the materialized frames
+@st.cache_data(show_spinner=False)
+def _scenario_frame(scenario_entries):
+    df = pd.DataFrame(scenario_entries)
+    if not df.empty:
+        # Rows carry plain dates; one bulk conversion here beats boxing
+        # a Timestamp per Add click
+        df['date'] = pd.to_datetime(df['date'])
+    return df
+
+@st.cache_data(show_spinner=False)
+def _combined_scenario_entries(time_entries_df, scenario_entries):
+    if not scenario_entries:
+        return time_entries_df
+    # Re-sorted so the month slicing downstream can keep binary-searching
+    return pd.concat([time_entries_df, _scenario_frame(scenario_entries)], ignore_index=True).sort_values('date', ignore_index=True)
+
 def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, non_work_days_df):
     st.header("🔮 Scenario Planning")
     st.info("Plan future work hours and see how they affect your monthly income. Changes here are NOT saved to your actual time entries.")
@@ -1059,7 +1230,7 @@ def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, n
         st.session_state.scenario_entries = []
     
     # Get active hourly clients
-    active_hourly_clients = sorted(clients_df[(clients_df['active'] == True) & (clients_df['billing_type'] == 'Hourly')]['client_name'].tolist())
+    active_hourly_clients = _active_hourly_client_names(clients_df)
     
     if not active_hourly_clients:
         st.warning("No active hourly clients to plan for.")
@@ -1080,7 +1251,7 @@ def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, n
         with col1:
             if st.form_submit_button("Add to Scenario", type="primary"):
                 st.session_state.scenario_entries.append({
-                    'date': pd.Timestamp(scenario_date),
+                    'date': scenario_date,
                     'client_name': scenario_client,
                     'hours': scenario_hours
                 })
@@ -1095,14 +1266,14 @@ def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, n
     # Show current scenario entries
     if st.session_state.scenario_entries:
         st.subheader("Current Scenario Entries")
-        scenario_df = pd.DataFrame(st.session_state.scenario_entries)
+        scenario_df = _scenario_frame(st.session_state.scenario_entries)
         scenario_df['date_str'] = scenario_df['date'].dt.strftime('%Y-%m-%d')
-        display_scenario = scenario_df[['date_str', 'client_name', 'hours']].copy()
+        display_scenario = scenario_df[['date_str', 'client_name', 'hours']]
         display_scenario.columns = ['Date', 'Client', 'Hours']
-        st.dataframe(display_scenario, width='stretch', hide_index=True)
+        st.table(display_scenario.style.hide(axis='index'))
     
-    # Combine actual and scenario data
-    combined_entries = pd.concat([time_entries_df, pd.DataFrame(st.session_state.scenario_entries)], ignore_index=True) if st.session_state.scenario_entries else time_entries_df
+    # Combine actual and scenario data (cached until either side changes)
+    combined_entries = _combined_scenario_entries(time_entries_df, st.session_state.scenario_entries)
     
     # Calculate stats with combined data
     stats = calculate_monthly_stats(selected_year, selected_month, clients_df, combined_entries, invoices_df, settings, non_work_days_df)
@@ -1129,45 +1300,11 @@ def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, n
         clients_with_limits = clients_df[(clients_df['has_hour_limit'] == True) & (clients_df['active'] == True)]
         
         if not clients_with_limits.empty:
-            limit_data = []
-            
-            for _, client in clients_with_limits.iterrows():
-                # Calculate hours with scenario data
-                hours_used = calculate_client_hours(
-                    client['client_name'], 
-                    combined_entries,  # Use combined entries including scenarios
-                    client['limit_type'],
-                    client['contract_start_date'],
-                    selected_year,
-                    selected_month
-                )
-                
-                hours_remaining = client['hour_limit'] - hours_used
-                percentage_used = (hours_used / client['hour_limit'] * 100) if client['hour_limit'] > 0 else 0
-                
-                # Determine status color
-                if percentage_used >= 90:
-                    status = "🔴 Critical"
-                elif percentage_used >= 75:
-                    status = "🟡 Warning"
-                else:
-                    status = "🟢 Good"
-                
-                limit_data.append({
-                    'Client': client['client_name'],
-                    'Limit Type': client['limit_type'],
-                    'Total Limit': f"{client['hour_limit']:.1f} hrs",
-                    'Hours Used': f"{hours_used:.1f} hrs",
-                    'Hours Remaining': f"{hours_remaining:.1f} hrs",
-                    'Usage %': f"{percentage_used:.1f}%",
-                    'Status': status
-                })
-            
-            if limit_data:
-                limit_df = pd.DataFrame(limit_data)
-                st.dataframe(limit_df, width='stretch', hide_index=True)
-            else:
-                st.info("No clients with hour limits have been used yet.")
+            # Same table builder as the dashboard, fed the combined
+            # entries so scenario hours count against the limits
+            entries_by_client = group_entries_by_client(combined_entries)
+            limit_df = _client_limits_table(clients_with_limits, entries_by_client, selected_year, selected_month)
+            st.table(limit_df.style.hide(axis='index'))
         else:
             st.info("No clients have hour limits set.")
     
@@ -1175,42 +1312,14 @@ def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, n
     st.markdown("---")
     st.subheader("Target vs Actuals (with Scenario)")
     
-    work_days_list = settings['work_days'].split(',')
-    
-    dates = []
-    targets = []
-    actuals = []
-    cumulative_actual = 0
-    cumulative_target = 0
-    
-    for day in range(1, calendar.monthrange(selected_year, selected_month)[1] + 1):
-        date = datetime(selected_year, selected_month, day)
-        dates.append(date)
-        
-        if is_work_day(date.date(), work_days_list, non_work_days_df):
-            cumulative_target += stats['daily_target']
-        
-        targets.append(cumulative_target)
-        
-        # Calculate actual income up to this date (hourly only)
-        if not combined_entries.empty and not clients_df.empty:
-            daily_entries = combined_entries[combined_entries['date'].dt.date == date.date()]
-            if not daily_entries.empty:
-                hourly_clients = clients_df[clients_df['billing_type'] == 'Hourly']
-                if not hourly_clients.empty:
-                    merged = daily_entries.merge(hourly_clients[['client_name', 'hourly_rate']], on='client_name', how='inner')
-                    if not merged.empty:
-                        daily_income = (merged['hours'] * merged['hourly_rate']).sum()
-                        cumulative_actual += daily_income
-        
-        # Add retainer/flat fee income
-        if not invoices_df.empty:
-            daily_invoices = invoices_df[invoices_df['date'].dt.date == date.date()]
-            if not daily_invoices.empty:
-                cumulative_actual += daily_invoices['amount'].sum()
-        
-        actuals.append(cumulative_actual)
-    
+    # Same vectorized builder as the dashboard chart, fed the combined
+    # actual+scenario entries instead of a day-by-day filter loop
+    dates, targets, actuals = _build_targets_actuals(
+        selected_year, selected_month, clients_df, combined_entries,
+        invoices_df, non_work_days_df, stats['daily_target'], settings['work_days']
+    )
+
+
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=dates, y=targets, mode='lines', name='Target', line=dict(color='red', width=2)))
     fig.add_trace(go.Scatter(x=dates, y=actuals, mode='lines', name='Actuals + Scenario', line=dict(color='blue', width=2)))
@@ -1218,8 +1327,9 @@ def show_scenario_planning(clients_df, time_entries_df, invoices_df, settings, n
     # Add vertical line for today's date
     today = datetime.now()
     today_midnight = datetime(today.year, today.month, today.day)
-    if datetime(selected_year, selected_month, 1) <= today <= datetime(selected_year, selected_month, calendar.monthrange(selected_year, selected_month)[1], 23, 59, 59):
-        max_y = max(max(targets), max(actuals)) if actuals else max(targets)
+    month_start_dt, month_end_dt = _month_bounds(selected_year, selected_month)
+    if month_start_dt <= today_midnight <= month_end_dt:
+        max_y = max(targets.max(), actuals.max())
         fig.add_trace(go.Scatter(
             x=[today_midnight, today_midnight],
             y=[0, max_y * 1.1],
@@ -1264,9 +1374,28 @@ def main():
     invoices_df = load_invoices()
     settings = load_settings()
     non_work_days_df = load_non_work_days()
-    
+
+    # A calendar-day click arrives as a ?toggle=YYYY-MM-DD query param
+    # (the calendar grid is plain HTML links, not per-day button widgets).
+    # Handle it before the page dispatch so the click survives the browser
+    # navigation, and steer the view back to the clicked month.
+    toggle = st.query_params.get('toggle')
+    if toggle:
+        st.query_params.clear()
+        toggle_date = pd.Timestamp(toggle)
+        st.session_state['nav'] = 'Calendar'
+        st.session_state['cal_month'] = toggle_date.month
+        st.session_state['cal_year'] = toggle_date.year
+        if not non_work_days_df.empty and (non_work_days_df['date'] == toggle_date).any():
+            # Toggle off: restore the day to a regular work day
+            save_non_work_days(non_work_days_df[non_work_days_df['date'] != toggle_date])
+            non_work_days_df = load_non_work_days()
+        else:
+            # Toggle on: ask for a reason via the calendar page's form
+            st.session_state.setdefault('pending_nwd', set()).add(toggle_date.date())
+
     # Sidebar navigation
-    page = st.sidebar.radio("Navigation", ["Dashboard", "Calendar", "Time Entry", "Client Management", "Invoices", "Scenario Planning", "Settings"])
+    page = st.sidebar.radio("Navigation", ["Dashboard", "Calendar", "Time Entry", "Client Management", "Invoices", "Scenario Planning", "Settings"], key='nav')
     
     if page == "Dashboard":
         show_dashboard(clients_df, time_entries_df, invoices_df, settings, non_work_days_df)